@@ -1,4 +1,4 @@
-# Copyright (c) 2022 - 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2022 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """This module contains the spec for the GitLab service.
@@ -210,6 +210,8 @@ class GitLab(BaseGitService):
                 "Failed to set the remote origin URL because this repository is in an unexpected state."
                 " Consider removing the cloned repository."
             ) from error
+        finally:
+            git_url.invalidate_repo_cache(git_obj)
 
         check_out_status = git_url.check_out_repo_target(git_obj, branch, digest, offline_mode)
 
@@ -220,6 +222,8 @@ class GitLab(BaseGitService):
                 "Failed to set the remote origin URL because this repository is in an unexpected state."
                 " Consider removing the cloned repository."
             ) from error
+        finally:
+            git_url.invalidate_repo_cache(git_obj)
 
         if not check_out_status:
             raise RepoCheckOutError(
@@ -1,20 +1,26 @@
-# Copyright (c) 2022 - 2025, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2022 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """This module provides methods to perform generic actions on Git URLS."""
 
 
+import collections
+import concurrent.futures
+import functools
 import logging
 import os
 import re
 import string
 import subprocess  # nosec B404
+import threading
 import urllib.parse
+import weakref
+from collections.abc import Iterable, Iterator
 from configparser import ConfigParser
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from git import GitCommandError
-from git.objects import Commit
 from git.repo import Repo
 from packaging import version
 from pydriller.git import Git
@@ -24,12 +30,101 @@ from macaron.config.global_config import global_config
 from macaron.environment_variables import get_patched_env
 from macaron.errors import CloneError, GitTagError
 
+if TYPE_CHECKING:
+    from git.objects import Commit
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 
 GIT_REPOS_DIR = "git_repos"
 """The directory in the output dir to store all cloned repositories."""
 
+_URL_PREFIX_RE = re.compile(r"\A(?P<prefix>.*?)(?=git\+http|http|ftp|ssh\+git|ssh|git@)")
+"""The pattern to find the extraneous prefix (e.g. "scm:", "git:") of a repository url."""
+
+_URL_NO_PREFIX_STARTS = ("http://", "https://", "git@")
+"""The most common starts of repository urls, which cannot have an extraneous prefix."""
+
+_OBJECT_NAME_RE = re.compile(r"\A(?:[0-9a-f]{40}|[0-9a-f]{64})\Z")
+"""The pattern of a full SHA-1 or SHA-256 git object name."""
+
+_ANY_CASE_OBJECT_NAME_RE = re.compile(_OBJECT_NAME_RE.pattern, re.IGNORECASE)
+"""The pattern of a full git object name in any case, which is never a valid repository url."""
+
+_COMMIT_HASH_RE = re.compile(r"[a-f0-9]{7,40}")
+"""The pattern of a full or abbreviated (at least 7 characters) git commit hash."""
+
+_LS_REMOTE_TAG_RE = re.compile(rb"^(?P<commit>[0-9a-f]+)\trefs/tags/(?P<tag>[^\s^]+)(?:\^\{\})?$", re.MULTILINE)
+"""The pattern of a tag reference in the raw output of ``git ls-remote --tags``.
+
+The optional ``^{}`` suffix marks the peeled reference of an annotated tag.
+"""
+
+_VERSION_TAG_START_RE = re.compile(r"\s*[vV]?[0-9]")
+"""The pattern of the start of a PEP 440 version, i.e. an optional ``v`` prefix followed by a digit."""
+
+_LOWEST_TAG_VERSION = version.Version("0")
+"""The version that tags must be higher than to be considered by :func:`find_highest_git_tag`."""
+
+_BRANCH_MARKER_TABLE = str.maketrans("", "", "*")
+"""The translation table to remove the ``*`` marker of the current branch in the output of ``git branch``."""
+
+
+_ALLOWED_HOST_CHARS = frozenset(string.ascii_lowercase + string.digits)
+"""The characters allowed in the directory name of a git host."""
+
+
+class _HostSanitizeTable(dict[int, int]):
+    """The translation table that replaces the characters not allowed in a directory name of a git host with ``_``.
+
+    Only the characters in :data:`_ALLOWED_HOST_CHARS` are allowed. Uppercase ASCII letters are mapped to
+    their lowercase counterparts, so that lowercasing and sanitizing the host take a single pass. Every other
+    character, including non-ASCII ones, is missing from the table and is mapped to ``_``.
+    """
+
+    def __missing__(self, key: int) -> int:
+        return ord("_")
+
+
+_HOST_SANITIZE_TABLE = _HostSanitizeTable(
+    {ord(char): ord(char) for char in _ALLOWED_HOST_CHARS}
+    | {ord(char): ord(char.lower()) for char in string.ascii_uppercase}
+)
+"""The translation table used to sanitize the git host in :func:`get_repo_dir_name`."""
+
+_TRIVIAL_REPO_URL_RE = re.compile(
+    r"\Ahttps://(?P<host>[a-z0-9.-]+)/(?P<path>[A-Za-z0-9_-][A-Za-z0-9_.-]*/(?!\.git\Z)[A-Za-z0-9_.-]+?)(?:\.git)?\Z"
+)
+"""The pattern of a plain ``https://<host>/<owner>/<name>`` repository url, which needs no further parsing."""
+
+_MAX_URL_LENGTH = 2048
+"""The maximum length of a repository url. Longer urls are rejected before being parsed."""
+
+_URL_REPARSE_RE = re.compile(r"[\s?#;]")
+"""Characters in a repository path that urllib handles specially, so that the path has to be parsed again."""
+
+_URL_CACHE_SIZE = 4096
+"""The maximum number of results cached by the url parsing functions."""
+
+_TAGS_CACHE_SIZE = 256
+"""The maximum number of repositories whose tags are cached by :func:`get_tags_via_git_remote`."""
+
+_TAGS_CACHE: collections.OrderedDict[str, dict[str, str]] = collections.OrderedDict()
+"""The tags of the most recently used repositories, obtained by :func:`get_tags_via_git_remote`."""
+
+_TAGS_CACHE_LOCK = threading.Lock()
+"""The lock guarding :data:`_TAGS_CACHE`, because ``ls-remote`` commands may run concurrently."""
+
+_GIT_ENV_PATCH = {
+    # Setting the GIT_TERMINAL_PROMPT environment variable to ``0`` stops
+    # ``git clone`` and ``git fetch`` from prompting for login credentials.
+    "GIT_TERMINAL_PROMPT": "0",
+}
+"""The patch applied to the environment of the git processes that access a remote repository."""
+
+_REMOTE_ORIGIN_CACHE: weakref.WeakKeyDictionary[Git, str] = weakref.WeakKeyDictionary()
+"""The origin remote of each repository, obtained by :func:`get_remote_origin_of_local_repo`."""
+
 
 def parse_git_branch_output(content: str) -> list[str]:
     """Return the list of branch names from a string that has a format similar to the output of ``git branch --list``.
@@ -63,22 +158,45 @@ def parse_git_branch_output(content: str) -> list[str]:
      'remotes/origin/v2.dev',
      'remotes/origin/v3.dev']
     """
-    git_branch_output_lines = content.splitlines()
-    branches = []
-    for line in git_branch_output_lines:
+    return list(parse_git_branch_output_iter(content))
+
+
+def parse_git_branch_output_iter(content: str) -> Iterator[str]:
+    """Yield the branch names from a string that has a format similar to the output of ``git branch --list``.
+
+    This is the lazy version of :func:`parse_git_branch_output`, for callers that can stop early
+    (e.g. when looking for a specific branch).
+
+    Parameters
+    ----------
+    content : str
+        The raw output as string from the ``git branch`` command.
+
+    Yields
+    ------
+    str
+        Each branch element from the raw output.
+
+    Examples
+    --------
+    >>> content = '''
+    ... * master
+    ...   remotes/origin/master
+    ... '''
+    >>> any(branch == "remotes/origin/master" for branch in parse_git_branch_output_iter(content))
+    True
+    """
+    for line in content.splitlines():
         # The ``*`` symbol will appear next to the branch name where HEAD is currently on.
-        # Branches in git cannot have ``*`` in its name so we can safely replace without tampering with its actual name.
+        # Branches in git cannot have ``*`` in its name so we can safely remove it without tampering with its
+        # actual name.
         # https://git-scm.com/docs/git-check-ref-format
-        branch = line.replace("*", "").strip()
+        branch = line.translate(_BRANCH_MARKER_TABLE).strip()
 
         # Ignore elements that contain only whitespaces. This is because the raw content of git branch
-        # can have extra new line at the end, which can be picked up as an empty element in `git_branch_output_lines`.
-        if len(branch) == 0:
-            continue
-
-        branches.append(branch)
-
-    return branches
+        # can have extra new line at the end, which can be picked up as an empty line.
+        if branch:
+            yield branch
 
 
 def get_branches_containing_commit(git_obj: Git, commit: str, remote: str = "origin") -> list[str]:
@@ -186,20 +304,21 @@ def check_out_repo_target(
             return False
 
     if branch_name and digest:
-        branches = get_branches_containing_commit(
-            git_obj=git_obj,
-            commit=digest,
-            remote="origin",
-        )
+        try:
+            # This command exits with status 0 if the commit is reachable from origin/<branch_name> and 1 if not.
+            # Unlike ``git branch --contains``, it only checks the one branch we are interested in.
+            git_obj.repo.git.merge_base("--is-ancestor", digest, f"origin/{branch_name}")
+        except GitCommandError as error:
+            if error.status == 1:
+                logger.error("Commit %s is not in branch %s.", digest, branch_name)
+            else:
+                logger.error("Cannot check whether commit %s is in branch %s.", digest, branch_name)
+            return False
 
-        if f"origin/{branch_name}" in branches:
-            try:
-                git_obj.repo.git.checkout("--force", f"{digest}")
-            except GitCommandError:
-                logger.debug("Cannot checkout commit %s.", digest)
-                return False
-        else:
-            logger.error("Commit %s is not in branch %s.", digest, branch_name)
+        try:
+            git_obj.repo.git.checkout("--force", f"{digest}")
+        except GitCommandError:
+            logger.debug("Cannot checkout commit %s.", digest)
             return False
 
     # Further validation to make sure the git checkout operations happen as expected.
@@ -216,6 +335,19 @@ def check_out_repo_target(
     return True
 
 
+def invalidate_repo_cache(git_obj: Git) -> None:
+    """Remove the cached origin remote of a repository.
+
+    This function must be called after the url of the origin remote of the repository is changed.
+
+    Parameters
+    ----------
+    git_obj : Git
+        The pydriller.Git wrapper object of the target repository.
+    """
+    _REMOTE_ORIGIN_CACHE.pop(git_obj, None)
+
+
 def get_default_branch(git_obj: Git) -> str:
     """Return the default branch name of the target repository.
 
@@ -270,7 +402,7 @@ def is_remote_repo(path_to_repo: str) -> bool:
     return True
 
 
-def clone_remote_repo(clone_dir: str, url: str) -> Repo | None:
+def clone_remote_repo(clone_dir: str, url: str, branch: str = "", digest: str = "") -> Repo | None:
     """Clone the remote repository and return the `git.Repo` object for that repository.
 
     If there is an existing non-empty ``clone_dir``, Macaron assumes the repository has
@@ -284,6 +416,16 @@ def clone_remote_repo(clone_dir: str, url: str) -> Repo | None:
     - https://git-scm.com/docs/git-rev-list
     - https://github.blog/2020-12-21-get-up-to-speed-with-partial-clone-and-shallow-clone
 
+    If the caller only needs a single revision, ``branch`` or ``digest`` can be provided to make
+    a shallow clone of that revision instead:
+    - If only ``digest`` is provided and it is a full commit hash, only that commit is fetched.
+    - If only ``branch`` is provided, only the tip of that branch is fetched.
+    - Otherwise, the full history is cloned, because checking whether ``digest`` is in ``branch``
+      requires the history of ``branch``.
+    Note that a shallow clone does not have the history of the repository nor the ``origin/HEAD``
+    reference (see :func:`get_default_branch`). These hints have no effect if the repository has
+    already been cloned.
+
     Parameters
     ----------
     clone_dir : str
@@ -291,6 +433,10 @@ def clone_remote_repo(clone_dir: str, url: str) -> Repo | None:
     url : str
         The url to clone the repository.
         Important: this can contain secrets! (e.g. cloning with GitLab token)
+    branch : str
+        The name of the only branch to clone, or empty to clone all branches (default: "").
+    digest : str
+        The hash of the only commit to fetch, or empty to fetch the full history (default: "").
 
     Returns
     -------
@@ -312,58 +458,76 @@ def clone_remote_repo(clone_dir: str, url: str) -> Repo | None:
             logger.debug("The clone dir %s is empty. It has been deleted for cloning the repo.", clone_dir)
         except OSError:
             # Update the existing repository by running ``git fetch`` inside the existing directory.
-            # The flags `--force --tags --prune --prune-tags` are used to make sure we analyze the most up-to-date
-            # version of the repo.
+            # The flags `--force --prune` together with the explicit branch and tag refspecs are used to make sure
+            # we analyze the most up-to-date version of the repo.
             #   - Any modified tags in the remote repository are updated locally.
             #   - Deleted branches and tags in the remote repository are pruned from the local copy.
+            # Listing both refspecs explicitly lets git negotiate branches and tags in a single exchange with the
+            # remote. The tag refspec with `--prune` is equivalent to the `--tags --prune-tags` flags.
+            # The flag `--no-show-forced-updates` skips the commit graph walk that only serves to report forced
+            # updates. Automatic garbage collection is kept, so that the packs added by repeated updates of
+            # the same repository are still consolidated.
             # References:
             #   https://git-scm.com/docs/git-fetch
             #   https://github.com/oracle/macaron/issues/547
             try:
-                git_env_patch = {
-                    # Setting the GIT_TERMINAL_PROMPT environment variable to ``0`` stops
-                    # ``git clone`` from prompting for login credentials.
-                    "GIT_TERMINAL_PROMPT": "0",
-                }
                 subprocess.run(  # nosec B603
-                    args=["git", "fetch", "origin", "--force", "--tags", "--prune", "--prune-tags"],
-                    capture_output=True,
+                    args=[
+                        "git",
+                        "fetch",
+                        "origin",
+                        "--force",
+                        "--prune",
+                        "--no-show-forced-updates",
+                        "+refs/heads/*:refs/remotes/origin/*",
+                        "+refs/tags/*:refs/tags/*",
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                     cwd=clone_dir,
                     # If `check=True` and return status code is not zero, subprocess.CalledProcessError is
                     # raised, which we don't want. We want to check the return status code of the subprocess
                     # later on.
                     check=False,
-                    env=get_patched_env(git_env_patch),
+                    env=get_patched_env(_GIT_ENV_PATCH),
                 )
                 return Repo(path=clone_dir)
             except (subprocess.CalledProcessError, OSError):
-                logger.debug("The clone dir %s is not empty. An attempt to update it failed.")
+                logger.debug("The clone dir %s is not empty. An attempt to update it failed.", clone_dir)
                 return None
 
     # Ensure that the parent directory where the repo is cloned into exists.
     parent_dir = Path(clone_dir).parent
     parent_dir.mkdir(parents=True, exist_ok=True)
 
+    clone_args = ["git", "clone", "--filter=tree:0"]
+    shallow_digest = ""
+    if digest and not branch and _OBJECT_NAME_RE.match(digest):
+        # Only fetch the commit object at the tip of the default branch here. The target commit is
+        # fetched afterward and its trees and blobs are retrieved lazily when it is checked out.
+        clone_args.extend(["--depth=1", "--no-checkout"])
+        shallow_digest = digest
+    elif branch and not digest:
+        clone_args.extend(["--depth=1", "--single-branch", "--branch", branch])
+
+    # The same environment is used for the clone and the fetch of the target commit.
+    git_env = get_patched_env(_GIT_ENV_PATCH)
     try:
-        git_env_patch = {
-            # Setting the GIT_TERMINAL_PROMPT environment variable to ``0`` stops
-            # ``git clone`` from prompting for login credentials.
-            "GIT_TERMINAL_PROMPT": "0",
-        }
         result = subprocess.run(  # nosec B603
-            args=["git", "clone", "--filter=tree:0", url],
-            capture_output=True,
+            args=[*clone_args, url],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             cwd=parent_dir,
             # If `check=True` and return status code is not zero, subprocess.CalledProcessError is
             # raised, which we don't want. We want to check the return status code of the subprocess
             # later on.
             check=False,
-            env=get_patched_env(git_env_patch),
+            env=git_env,
         )
     except (subprocess.CalledProcessError, OSError):
         # Here, we raise from ``None`` to be extra-safe that no token is leaked.
-        # We should never store or print out the captured output from the subprocess
-        # because they might contain the secret-embedded URL.
+        # The output of the subprocess is discarded rather than captured
+        # because it might contain the secret-embedded URL.
         raise CloneError("Failed to clone repository.") from None
 
     if result.returncode != 0:
@@ -371,6 +535,26 @@ def clone_remote_repo(clone_dir: str, url: str) -> Repo | None:
             "Failed to clone repository: the `git clone --filter=tree:0` command exited with non-zero return code."
         )
 
+    if shallow_digest:
+        # Fetching a commit by its hash requires the server to allow it (e.g. with
+        # ``uploadpack.allowReachableSHA1InWant``), which is the case for the major git services.
+        try:
+            result = subprocess.run(  # nosec B603
+                args=["git", "fetch", "--depth=1", "origin", shallow_digest],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=clone_dir,
+                check=False,
+                env=git_env,
+            )
+        except (subprocess.CalledProcessError, OSError):
+            raise CloneError(f"Failed to fetch commit {shallow_digest}.") from None
+
+        if result.returncode != 0:
+            raise CloneError(
+                f"Failed to fetch commit {shallow_digest}: the `git fetch` command exited with non-zero return code."
+            )
+
     return Repo(path=clone_dir)
 
 
@@ -389,6 +573,30 @@ def list_remote_references(arguments: list[str], repo: str) -> str | None:
     str
         The result of the command.
     """
+    output = list_remote_references_bytes(arguments, repo)
+    if output is None:
+        return None
+
+    return output.decode("utf-8")
+
+
+def list_remote_references_bytes(arguments: list[str], repo: str) -> bytes | None:
+    """Retrieve references from a remote repository using Git's ``ls-remote``, without decoding them.
+
+    This allows large outputs to be parsed without decoding the parts that are not needed.
+
+    Parameters
+    ----------
+    arguments: list[str]
+        The arguments to pass into the command.
+    repo: str
+        The repository to run the command on.
+
+    Returns
+    -------
+    bytes
+        The raw result of the command.
+    """
     try:
         result = subprocess.run(  # nosec B603
             args=["git", "ls-remote"] + arguments + [repo],
@@ -412,7 +620,32 @@ def list_remote_references(arguments: list[str], repo: str) -> str | None:
             logger.error("Failed to retrieve remote references from repo: %s", repo)
         return None
 
-    return result.stdout.decode("utf-8")
+    return result.stdout
+
+
+def list_remote_references_many(requests: list[tuple[list[str], str]], workers: int = 8) -> list[str | None]:
+    """Retrieve references from several remote repositories concurrently.
+
+    Each ``ls-remote`` command is run by :func:`list_remote_references` in a thread pool, because the
+    commands are independent and spend most of their time waiting on the network.
+
+    Parameters
+    ----------
+    requests: list[tuple[list[str], str]]
+        The pairs of arguments and repository to run the ``ls-remote`` command on.
+    workers: int
+        The maximum number of commands running at the same time.
+
+    Returns
+    -------
+    list[str | None]
+        The result of the command of each request, in the order of ``requests``, or None if the command failed.
+    """
+    if not requests:
+        return []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(requests))) as executor:
+        return list(executor.map(lambda request: list_remote_references(*request), requests))
 
 
 def resolve_local_path(start_dir: str, local_path: str) -> str:
@@ -436,11 +669,13 @@ def resolve_local_path(start_dir: str, local_path: str) -> str:
     # Resolve the path by joining dir and path.
     # Because strict mode is enabled, if a path doesn't exist or a symlink loop
     # is encountered, OSError is raised.
-    # ValueError is raised if we use both relative and absolute paths in os.path.commonpath.
+    # ValueError is raised if a path contains a null byte.
     try:
         dir_real = os.path.realpath(start_dir, strict=True)
-        resolve_path = os.path.realpath(os.path.join(start_dir, local_path), strict=True)
-        if os.path.commonpath([resolve_path, dir_real]) != dir_real:
+        resolve_path = os.path.realpath(os.path.join(dir_real, local_path), strict=True)
+        # Both paths are absolute and canonical, so the containment check only needs to compare
+        # their components, without touching the file system again.
+        if not Path(resolve_path).is_relative_to(dir_real):
             return ""
 
         return resolve_path
@@ -529,15 +764,9 @@ def get_repo_complete_name_from_url(url: str) -> str:
     >>> get_repo_complete_name_from_url("https://github.com/apache/maven")
     'github.com/apache/maven'
     """
-    remote_url = get_remote_vcs_url(url)
-    if not remote_url:
-        logger.debug("URL '%s' is not valid.", url)
-        return ""
-
-    parsed_url = parse_remote_url(remote_url)
+    parsed_url = _parse_and_validate_remote_url(url, get_allowed_git_service_hostnames(defaults))
     if not parsed_url:
-        # Shouldn't happen.
-        logger.critical("URL '%s' is not valid even though it has been validated.", url)
+        logger.debug("URL '%s' is not valid.", url)
         return ""
 
     git_host = parsed_url.netloc
@@ -548,6 +777,7 @@ def get_remote_origin_of_local_repo(git_obj: Git) -> str:
     """Get the origin remote of a repository.
 
     Note that this origin remote can be either a remote url or a path to a local repo.
+    The result is cached for each ``git_obj`` until :func:`invalidate_repo_cache` is called.
 
     Parameters
     ----------
@@ -559,6 +789,9 @@ def get_remote_origin_of_local_repo(git_obj: Git) -> str:
     str
         The origin remote path or empty if error.
     """
+    if remote_origin_path := _REMOTE_ORIGIN_CACHE.get(git_obj):
+        return remote_origin_path
+
     try:
         remote_origin = git_obj.repo.remote("origin")
         remote_urls = [*remote_origin.urls]
@@ -578,24 +811,16 @@ def get_remote_origin_of_local_repo(git_obj: Git) -> str:
     # This is because cloning from GitLab with an access token requires us to embed
     # the token in the URL.
     if "oauth2" in remote_origin_path:
-        try:
-            url_parse_result = urllib.parse.urlparse(remote_origin_path)
-        except ValueError:
-            logger.error("Error occurs while processing the remote URL of repo %s.", git_obj.project_name)
-            return ""
-
-        _, _, hostname = url_parse_result.netloc.rpartition("@")
-
-        new_url_parse_result = urllib.parse.ParseResult(
-            scheme=url_parse_result.scheme,
-            netloc=hostname,
-            path=url_parse_result.path,
-            params=url_parse_result.params,
-            query=url_parse_result.query,
-            fragment=url_parse_result.fragment,
-        )
-        remote_origin_path = urllib.parse.urlunparse(new_url_parse_result)
-
+        # Only the user info (``oauth2:<token>@``) in the authority of the URL is removed, so plain string
+        # operations are enough here.
+        scheme, scheme_separator, rest = remote_origin_path.partition("://")
+        if scheme_separator:
+            netloc, path_separator, path = rest.partition("/")
+            _, _, hostname = netloc.rpartition("@")
+            remote_origin_path = f"{scheme}://{hostname}{path_separator}{path}"
+
+    if remote_origin_path:
+        _REMOTE_ORIGIN_CACHE[git_obj] = remote_origin_path
     return remote_origin_path or ""
 
 
@@ -618,7 +843,9 @@ def clean_up_repo_path(repo_path: str) -> str:
     return cleaned_path[:-4] if cleaned_path.endswith(".git") else cleaned_path
 
 
-def get_remote_vcs_url(url: str, clean_up: bool = True) -> str:
+def get_remote_vcs_url(
+    url: str, clean_up: bool = True, allowed_git_service_hostnames: Iterable[str] | None = None
+) -> str:
     """Verify if the given repository path is a valid vcs.
 
     We support some of the patterns listed in https://git-scm.com/docs/git-clone#_git_urls.
@@ -629,13 +856,17 @@ def get_remote_vcs_url(url: str, clean_up: bool = True) -> str:
         The path of the repository to check.
     clean_up : bool
         Set to True to clean up the returned remote url (default: True).
+    allowed_git_service_hostnames: Iterable[str] | None
+        The allowed git service hostnames.
+        If this is ``None``, fallback to the ``.ini`` configuration.
+        (Default: None).
 
     Returns
     -------
     str
         The remote url to the repo or empty if the url is invalid.
     """
-    parsed_result = parse_remote_url(url)
+    parsed_result = parse_remote_url(url, allowed_git_service_hostnames)
     if not parsed_result:
         return ""
 
@@ -647,9 +878,48 @@ def get_remote_vcs_url(url: str, clean_up: bool = True) -> str:
     return url_as_str
 
 
+def _parse_and_validate_remote_url(
+    url: str, allowed_git_service_hostnames: frozenset[str]
+) -> urllib.parse.ParseResult | None:
+    """Parse the url of a repository and validate it in a single pass.
+
+    The result is the same as calling :func:`parse_remote_url` on the url returned by
+    :func:`get_remote_vcs_url`, without building that url and parsing it again.
+
+    Parameters
+    ----------
+    url: str
+        The path of the repository to check.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
+
+    Returns
+    -------
+    urllib.parse.ParseResult | None
+        The parse result of the cleaned up url or None if the url is invalid.
+    """
+    parsed_url = parse_remote_url(url, allowed_git_service_hostnames)
+    if not parsed_url or not parsed_url.netloc:
+        return None
+
+    if _URL_REPARSE_RE.search(parsed_url.path):
+        # Let urllib handle the special characters the same way as for any other url.
+        remote_url = clean_up_repo_path(urllib.parse.urlunparse(parsed_url))
+        return parse_remote_url(remote_url, allowed_git_service_hostnames)
+
+    path = _get_owner_and_name(clean_up_repo_path(parsed_url.path))
+    if not path:
+        return None
+
+    return parsed_url._replace(path=path)
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
 def clean_url(url: str) -> urllib.parse.ParseResult | None:
     """Clean the passed url, removing extraneous prefixes and parsing it with urllib.
 
+    The results are cached, since the same urls are cleaned repeatedly during an analysis.
+
     Parameters
     ----------
     url: str
@@ -660,9 +930,17 @@ def clean_url(url: str) -> urllib.parse.ParseResult | None:
     ParseResult:
         The parsed URL.
     """
+    # Commit hashes are sometimes passed in place of urls. Reject them without running the regex below.
+    if _ANY_CASE_OBJECT_NAME_RE.match(str(url)):
+        return None
+
     try:
+        if url.startswith(_URL_NO_PREFIX_STARTS):
+            return urllib.parse.urlparse(url)
+
         # Remove prefixes, such as "scm:" and "git:".
-        match = re.match(r"(?P<prefix>(.*?))(git\+http|http|ftp|ssh\+git|ssh|git@)(.)*", str(url))
+        # The lookahead only matches up to the scheme, so the rest of the url is not scanned.
+        match = _URL_PREFIX_RE.match(str(url))
         if match is None:
             return None
         cleaned_url = url.replace(match.group("prefix"), "")
@@ -675,20 +953,21 @@ def clean_url(url: str) -> urllib.parse.ParseResult | None:
 
 
 def parse_remote_url(
-    url: str, allowed_git_service_hostnames: list[str] | None = None
+    url: str, allowed_git_service_hostnames: Iterable[str] | None = None
 ) -> urllib.parse.ParseResult | None:
     """Verify if the given repository path is a valid vcs.
 
     This method converts the url to a ``https://`` url and return a
     ``urllib.parse.ParseResult object`` to be consumed by Macaron.
     Note that the port number in the original url will be removed.
+    Urls longer than 2048 characters are rejected without being parsed.
 
     Parameters
     ----------
     url: str
         The path of the repository to check.
-    allowed_git_service_hostnames: list[str] | None
-        The list of allowed git service hostnames.
+    allowed_git_service_hostnames: Iterable[str] | None
+        The allowed git service hostnames.
         If this is ``None``, fall back to the  ``.ini`` configuration.
         (Default: None).
 
@@ -702,85 +981,54 @@ def parse_remote_url(
     >>> parse_remote_url("ssh://git@github.com:7999/owner/org.git")
     ParseResult(scheme='https', netloc='github.com', path='owner/org.git', params='', query='', fragment='')
     """
-    if allowed_git_service_hostnames is None:
-        allowed_git_service_hostnames = get_allowed_git_service_hostnames(defaults)
-
-    parsed_url = clean_url(url)
-    if not parsed_url:
+    if len(url) > _MAX_URL_LENGTH:
         return None
 
-    res_scheme = ""
-    res_path = ""
-    res_netloc = ""
-
-    # e.g., https://github.com/owner/project.git
-    if parsed_url.scheme in {"http", "https", "ftp", "ftps", "git+https"}:
-        if parsed_url.netloc not in allowed_git_service_hostnames:
-            return None
-        path_params = parsed_url.path.strip("/").split("/")
-        if len(path_params) < 2:
-            return None
+    if allowed_git_service_hostnames is None:
+        allowed_git_service_hostnames = get_allowed_git_service_hostnames(defaults)
 
-        res_path = "/".join(path_params[:2])
-        res_scheme = "https"
-        res_netloc = parsed_url.netloc
+    # The allowed hostnames are part of the cache key, so that the cached results
+    # stay correct when the configuration is reloaded.
+    return _parse_remote_url(url, frozenset(allowed_git_service_hostnames))
 
-    # e.g.:
-    #   ssh://git@hostname:port/owner/project.git
-    #   ssh://git@hostname:owner/project.git
-    elif parsed_url.scheme in {"ssh", "git+ssh"}:
-        user_host, _, port = parsed_url.netloc.partition(":")
-        user, _, host = user_host.rpartition("@")
 
-        if not user or host not in allowed_git_service_hostnames:
-            return None
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def _parse_remote_url(url: str, allowed_git_service_hostnames: frozenset[str]) -> urllib.parse.ParseResult | None:
+    """Parse the url of a repository hosted on one of the allowed git services.
 
-        path = ""
-        if not port.isdecimal():
-            # Happen for ssh://git@github.com:owner/project.git
-            # where parsed_url.netloc="git@github.com:owner", port="owner"
-            # and parsed_url.path="project.git".
-            # In this case, we merge port with parsed_url.path
-            # to get the full path.
-            path = f"{port}/{parsed_url.path.strip('/')}"
-        else:
-            path = parsed_url.path
+    This is the cached implementation of :func:`parse_remote_url`.
 
-        path_params = path.strip("/").split("/")
-        if len(path_params) < 2:
-            return None
+    Parameters
+    ----------
+    url: str
+        The path of the repository to check.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
 
-        res_path = f"{path_params[0]}/{path_params[1]}"
-        res_scheme = "https"
-        res_netloc = host
+    Returns
+    -------
+    urllib.parse.ParseResult | None
+        The parse result of the url or None if errors.
+    """
+    parsed_url = clean_url(url)
+    if not parsed_url:
+        return None
 
-    # e.g., git@github.com:owner/project.git
+    res_scheme = "https"
+    if parsed_url.scheme in {"http", "https", "ftp", "ftps", "git+https"}:
+        host_and_path = _parse_https_url(parsed_url, allowed_git_service_hostnames)
+    elif parsed_url.scheme in {"ssh", "git+ssh"}:
+        host_and_path = _parse_ssh_url(parsed_url, allowed_git_service_hostnames)
     elif parsed_url.scheme == "":
-        user_host, _, port_path = parsed_url.path.partition(":")
-        if not user_host or not port_path:
-            return None
-        user, _, host = user_host.rpartition("@")
-        if not user or host not in allowed_git_service_hostnames:
-            return None
+        host_and_path = _parse_scp_url(parsed_url, allowed_git_service_hostnames)
+    else:
+        # Other schemes result in an empty parse result.
+        res_scheme = ""
+        host_and_path = ("", "")
 
-        path = ""
-        port_num, _, path_remain = port_path.strip("/").partition("/")
-        if not port_num.isdecimal():
-            # port_path doesn't have any port number (e.g. port_path == /org/name).
-            # We use all of port_path as the path.
-            path = port_path
-        else:
-            # port_path have valid port number (e.g. port_path == 7999/org/name).
-            # We only use the rest of the path.
-            path = path_remain
-
-        path_params = path.strip("/").split("/")
-        if len(path_params) < 2:
-            return None
-
-        res_path = f"{path_params[0]}/{path_params[1]}"
-        res_scheme = "https"
-        res_netloc = host
+    if not host_and_path:
+        return None
+    res_netloc, res_path = host_and_path
 
     try:
         return urllib.parse.ParseResult(
@@ -796,7 +1044,146 @@ def parse_remote_url(
         return None
 
 
-def get_allowed_git_service_hostnames(config: ConfigParser) -> list[str]:
+def _get_owner_and_name(path: str) -> str | None:
+    """Return the ``<owner>/<name>`` part at the start of a repository path.
+
+    Parameters
+    ----------
+    path: str
+        The path of the repository url.
+
+    Returns
+    -------
+    str | None
+        The first two components of the path, or None if the path has less than two components.
+    """
+    # Splitting stops after the second separator, so the rest of long paths is not scanned.
+    path_params = path.strip("/").split("/", 2)
+    if len(path_params) < 2:
+        return None
+
+    return f"{path_params[0]}/{path_params[1]}"
+
+
+def _parse_https_url(
+    parsed_url: urllib.parse.ParseResult, allowed_git_service_hostnames: frozenset[str]
+) -> tuple[str, str] | None:
+    """Return the hostname and the ``<owner>/<name>`` path of a http(s)-like repository url.
+
+    e.g., https://github.com/owner/project.git
+
+    Parameters
+    ----------
+    parsed_url: urllib.parse.ParseResult
+        The parsed repository url.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        The hostname and the path, or None if the url is not valid.
+    """
+    if parsed_url.netloc not in allowed_git_service_hostnames:
+        return None
+
+    path = _get_owner_and_name(parsed_url.path)
+    if not path:
+        return None
+
+    return parsed_url.netloc, path
+
+
+def _parse_ssh_url(
+    parsed_url: urllib.parse.ParseResult, allowed_git_service_hostnames: frozenset[str]
+) -> tuple[str, str] | None:
+    """Return the hostname and the ``<owner>/<name>`` path of a ssh repository url.
+
+    e.g.:
+      ssh://git@hostname:port/owner/project.git
+      ssh://git@hostname:owner/project.git
+
+    Parameters
+    ----------
+    parsed_url: urllib.parse.ParseResult
+        The parsed repository url.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        The hostname and the path, or None if the url is not valid.
+    """
+    user_host, _, port = parsed_url.netloc.partition(":")
+    user, _, host = user_host.rpartition("@")
+
+    if not user or host not in allowed_git_service_hostnames:
+        return None
+
+    path = ""
+    if not port.isdecimal():
+        # Happen for ssh://git@github.com:owner/project.git
+        # where parsed_url.netloc="git@github.com:owner", port="owner"
+        # and parsed_url.path="project.git".
+        # In this case, we merge port with parsed_url.path
+        # to get the full path.
+        path = f"{port}/{parsed_url.path.strip('/')}"
+    else:
+        path = parsed_url.path
+
+    owner_and_name = _get_owner_and_name(path)
+    if not owner_and_name:
+        return None
+
+    return host, owner_and_name
+
+
+def _parse_scp_url(
+    parsed_url: urllib.parse.ParseResult, allowed_git_service_hostnames: frozenset[str]
+) -> tuple[str, str] | None:
+    """Return the hostname and the ``<owner>/<name>`` path of a scp-like repository url.
+
+    e.g., git@github.com:owner/project.git
+
+    Parameters
+    ----------
+    parsed_url: urllib.parse.ParseResult
+        The parsed repository url.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        The hostname and the path, or None if the url is not valid.
+    """
+    user_host, _, port_path = parsed_url.path.partition(":")
+    if not user_host or not port_path:
+        return None
+    user, _, host = user_host.rpartition("@")
+    if not user or host not in allowed_git_service_hostnames:
+        return None
+
+    path = ""
+    port_num, _, path_remain = port_path.strip("/").partition("/")
+    if not port_num.isdecimal():
+        # port_path doesn't have any port number (e.g. port_path == /org/name).
+        # We use all of port_path as the path.
+        path = port_path
+    else:
+        # port_path have valid port number (e.g. port_path == 7999/org/name).
+        # We only use the rest of the path.
+        path = path_remain
+
+    owner_and_name = _get_owner_and_name(path)
+    if not owner_and_name:
+        return None
+
+    return host, owner_and_name
+
+
+def get_allowed_git_service_hostnames(config: ConfigParser) -> frozenset[str]:
     """Load allowed git service hostnames from ini configuration.
 
     Some notes for future improvements:
@@ -812,22 +1199,11 @@ def get_allowed_git_service_hostnames(config: ConfigParser) -> list[str]:
     A: Referencing ``GIT_SERVICES`` in this module results in cyclic imports since the module
     where ``GIT_SERVICES`` is defined in also reference this module.
     """
-    git_service_section_names = [
-        section_name for section_name in config.sections() if section_name.startswith("git_service")
-    ]
-
-    allowed_git_service_hostnames = []
-
-    for section_name in git_service_section_names:
-        git_service_section = config[section_name]
-
-        hostname = git_service_section.get("hostname")
-        if not hostname:
-            continue
-
-        allowed_git_service_hostnames.append(hostname)
-
-    return allowed_git_service_hostnames
+    return frozenset(
+        hostname
+        for section_name in config.sections()
+        if section_name.startswith("git_service") and (hostname := config.get(section_name, "hostname", fallback=""))
+    )
 
 
 def get_repo_dir_name(url: str, sanitize: bool = True) -> str:
@@ -836,7 +1212,7 @@ def get_repo_dir_name(url: str, sanitize: bool = True) -> str:
     The directory name will be in the form ``<git_host>/org/name``.
     When sanitize is True (default), this method
     makes sure that ``git_host`` is a valid directory name:
-    - Contains only lowercase letters and numbers
+    - Contains only lowercase letters and numbers, uppercase letters are converted to lowercase
     - Only starts with lowercase letters or numbers
     - Words are separated by ``_``
 
@@ -857,38 +1233,112 @@ def get_repo_dir_name(url: str, sanitize: bool = True) -> str:
     >>> get_repo_dir_name("https://github.com/apache/maven")
     'github_com/apache/maven'
     """
-    remote_url = get_remote_vcs_url(url)
-    if not remote_url:
-        logger.debug("URL '%s' is not valid.", url)
+    if len(url) > _MAX_URL_LENGTH:
+        logger.debug("URL '%s...' is too long.", url[:100])
         return ""
 
-    parsed_url = parse_remote_url(remote_url)
+    allowed_git_service_hostnames = get_allowed_git_service_hostnames(defaults)
+
+    # Most urls are plain https urls to a repository, which can be converted without being parsed.
+    if (
+        not sanitize
+        and (match := _TRIVIAL_REPO_URL_RE.match(url))
+        and match.group("host") in allowed_git_service_hostnames
+    ):
+        return f"{match.group('host')}/{match.group('path')}"
+
+    return _get_repo_dir_name(url, sanitize, allowed_git_service_hostnames)
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def _get_repo_dir_name(url: str, sanitize: bool, allowed_git_service_hostnames: frozenset[str]) -> str:
+    """Return the repo directory name from a remote repo url for the given allowed git service hostnames.
+
+    This is the cached implementation of :func:`get_repo_dir_name`, since the same urls are resolved
+    repeatedly during an analysis.
+
+    Parameters
+    ----------
+    url: str
+        The remote url of the target repository.
+    sanitize: bool
+        Sanitizes the name to be a valid directory name.
+    allowed_git_service_hostnames: frozenset[str]
+        The set of allowed git service hostnames.
+
+    Returns
+    -------
+    str
+        The unique path resolved from the remote path or an empty string if errors.
+    """
+    parsed_url = _parse_and_validate_remote_url(url, allowed_git_service_hostnames)
     if not parsed_url:
-        # Shouldn't happen.
-        logger.critical("URL '%s' is not valid even though it has been validated.", url)
+        logger.debug("URL '%s' is not valid.", url)
         return ""
 
     git_host = parsed_url.netloc
+    # The path of the url already uses ``/`` to separate the owner and the name, so the host is joined with ``/``
+    # as well rather than with the platform-dependent ``os.path.join``.
+    path = parsed_url.path.strip("/")
 
     if not sanitize:
-        return os.path.join(git_host, parsed_url.path.strip("/"))
+        return f"{git_host}/{path}"
 
     # Sanitize the path and make sure it's a valid directory name.
-    allowed_chars = string.ascii_lowercase + string.digits
-    for letter in git_host:
-        if letter not in allowed_chars:
-            git_host = git_host.replace(letter, "_", 1)
+    git_host = git_host.translate(_HOST_SANITIZE_TABLE)
 
     # Cannot start with _.
     if git_host.startswith("_"):
         git_host = f"mcn{git_host}"
 
-    return os.path.join(git_host, parsed_url.path.strip("/"))
+    return f"{git_host}/{path}"
 
 
 def is_empty_repo(git_obj: Git) -> bool:
     """Return True if the repo has no commit checked out.
 
+    Parameters
+    ----------
+    git_obj : Git
+        The pydriller.Git object of the repository.
+
+    Returns
+    -------
+    bool
+        True if the repo has no commit else False.
+    """
+    # The HEAD file and the references are read directly from the git directory, which avoids spawning a git
+    # process. We fall back to ``git rev-parse`` if the layout of the repository is not understood.
+    # https://git-scm.com/docs/gitrepository-layout
+    try:
+        git_dir = Path(git_obj.repo.git_dir)
+        common_dir = Path(git_obj.repo.common_dir)
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if _OBJECT_NAME_RE.match(head):
+            # HEAD is detached at a commit.
+            return False
+
+        ref_prefix, _, ref = head.partition(" ")
+        if ref_prefix == "ref:" and ref.startswith("refs/") and not (common_dir / "reftable").exists():
+            loose_ref = common_dir / ref
+            if loose_ref.is_file():
+                if _OBJECT_NAME_RE.match(loose_ref.read_text(encoding="utf-8").strip()):
+                    return False
+            else:
+                packed_refs = common_dir / "packed-refs"
+                if not packed_refs.is_file():
+                    return True
+                with open(packed_refs, encoding="utf-8") as packed_refs_file:
+                    return not any(line.rstrip("\n").endswith(f" {ref}") for line in packed_refs_file)
+    except (OSError, ValueError):
+        pass
+
+    return _is_empty_repo_via_rev_parse(git_obj)
+
+
+def _is_empty_repo_via_rev_parse(git_obj: Git) -> bool:
+    """Return True if the repo has no commit checked out, according to ``git rev-parse``.
+
     Parameters
     ----------
     git_obj : Git
@@ -910,6 +1360,7 @@ def is_empty_repo(git_obj: Git) -> bool:
         return True
 
 
+@functools.lru_cache(maxsize=1024)
 def is_commit_hash(value: str) -> bool:
     """Check if a given string is a valid Git commit hash.
 
@@ -935,13 +1386,17 @@ def is_commit_hash(value: str) -> bool:
     True
     >>> is_commit_hash('invalid_hash123')
     False
+    >>> is_commit_hash('e3a1b6c\\n')
+    False
     >>> is_commit_hash('master')
     False
     >>> is_commit_hash('main')
     False
     """
-    pattern = r"^[a-f0-9]{7,40}$"
-    return bool(re.match(pattern, value))
+    # Reject values of the wrong length before entering the regex engine.
+    if not 7 <= len(value) <= 40:
+        return False
+    return bool(_COMMIT_HASH_RE.fullmatch(value))
 
 
 def get_tags_via_git_remote(repo: str) -> dict[str, str] | None:
@@ -957,34 +1412,35 @@ def get_tags_via_git_remote(repo: str) -> dict[str, str] | None:
     dict[str]
         A dictionary of tags mapped to their commits, or None if the operation failed..
     """
-    tag_data = list_remote_references(["--tags"], repo)
+    # The tags of a repository are cached for the lifetime of the process. Failures are not cached so that
+    # they can be retried. A copy is returned so that callers cannot modify the cached tags.
+    with _TAGS_CACHE_LOCK:
+        if (cached_tags := _TAGS_CACHE.get(repo)) is not None:
+            _TAGS_CACHE.move_to_end(repo)
+            return dict(cached_tags)
+
+    tag_data = list_remote_references_bytes(["--tags"], repo)
     if not tag_data:
         return None
-    tags = {}
-
-    for tag_line in tag_data.splitlines():
-        tag_line = tag_line.strip()
-        if not tag_line:
-            continue
-        split = tag_line.split("\t")
-        if len(split) != 2:
-            continue
-        possible_tag = split[1]
-        if possible_tag.endswith("^{}"):
-            possible_tag = possible_tag[:-3]
-        elif possible_tag in tags:
-            # If a tag already exists, it must be the annotated reference of an annotated tag.
-            # In that case we skip the tag as it does not point to the proper source commit.
-            # Note that this should only happen if the tags are received out of standard order.
-            continue
-        possible_tag = possible_tag.replace("refs/tags/", "")
-        if not possible_tag:
-            continue
-        tags[possible_tag] = split[0]
+
+    # The output is parsed as bytes, so that only the tag names and their commits are decoded.
+    # The reference of an annotated tag points to the tag object, while its peeled reference points to the
+    # proper source commit. Git always emits the peeled reference right after the tag reference, so it
+    # overwrites the tag object in the dictionary.
+    tags = {
+        match.group("tag").decode("utf-8", "replace"): match.group("commit").decode("ascii")
+        for match in _LS_REMOTE_TAG_RE.finditer(tag_data)
+    }
 
     logger.debug("Found %s tags via ls-remote of %s", len(tags), repo)
 
-    return tags
+    with _TAGS_CACHE_LOCK:
+        _TAGS_CACHE[repo] = tags
+        _TAGS_CACHE.move_to_end(repo)
+        if len(_TAGS_CACHE) > _TAGS_CACHE_SIZE:
+            _TAGS_CACHE.popitem(last=False)
+
+    return dict(tags)
 
 
 def find_highest_git_tag(tags: set[str]) -> str:
@@ -1024,6 +1480,9 @@ def find_highest_git_tag(tags: set[str]) -> str:
     >>> find_highest_git_tag({"invalid", "1.0.0"})
     '1.0.0'
 
+    >>> find_highest_git_tag({"1.0", "v1.0"})
+    'v1.0'
+
     >>> find_highest_git_tag(set())
     Traceback (most recent call last):
         ...
@@ -1037,21 +1496,46 @@ def find_highest_git_tag(tags: set[str]) -> str:
     if not tags:
         raise GitTagError("No tags provided.")
 
-    highest_tag = None
-    highest_parsed_tag = version.Version("0")
+    parsed_tags: list[tuple[version.Version, str]] = []
 
     for tag in tags:
-        try:
-            parsed_tag = version.Version(tag)
-        except version.InvalidVersion:
+        parsed_tag = _parse_version_tag(tag)
+        if parsed_tag is None:
             logger.debug("Invalid version tag encountered while finding the highest tag: %s", tag)
-            continue
-
-        if parsed_tag > highest_parsed_tag:
-            highest_parsed_tag = parsed_tag
-            highest_tag = tag
+        elif parsed_tag > _LOWEST_TAG_VERSION:
+            parsed_tags.append((parsed_tag, tag))
 
-    if highest_tag is None:
+    if not parsed_tags:
         raise GitTagError("No valid version tag found.")
 
+    # Tags of equal versions (e.g. "v1.0" and "1.0") are ordered by name, so the result does not depend on
+    # the iteration order of the set.
+    _, highest_tag = max(parsed_tags)
+
     return highest_tag
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_version_tag(tag: str) -> version.Version | None:
+    """Parse a tag as a PEP 440 version.
+
+    The results are cached, since the tags of a repository are compared repeatedly during an analysis.
+
+    Parameters
+    ----------
+    tag : str
+        The tag to parse.
+
+    Returns
+    -------
+    version.Version | None
+        The parsed version, or None if the tag is not a valid version.
+    """
+    # Reject the tags that cannot be a version (e.g. branch-like names) without running the PEP 440 parser.
+    if not _VERSION_TAG_START_RE.match(tag):
+        return None
+
+    try:
+        return version.Version(tag)
+    except version.InvalidVersion:
+        return None
@@ -1,4 +1,4 @@
-# Copyright (c) 2023 - 2025, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2023 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """Fixtures for tests."""
@@ -487,6 +487,7 @@ def deps_dev_service_mock_(httpserver: HTTPServer, tmp_path: Path) -> dict:
     return {
         "api": api_endpoint,
         "purl": purl_endpoint,
+        "purl_path": f"/{api_endpoint}/{purl_endpoint}",
         "base_hostname": base_url_parsed.hostname,
         "base_scheme": base_url_parsed.scheme,
         "base_netloc": base_url_parsed.netloc,
@@ -1,4 +1,4 @@
-# Copyright (c) 2025 - 2025, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2025 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """This module tests the deps.dev repo finder."""
@@ -31,9 +31,7 @@ def test_find_repo_links_failures(
 ) -> None:
     """Test invalid links."""
     purl = PackageURL.from_string("pkg:pypi/example@2")
-    target_url = (
-        f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/pkg:{purl.type}/{purl.name}@{purl.version}"
-    )
+    target_url = f"{deps_dev_service_mock['purl_path']}/pkg:{purl.type}/{purl.name}@{purl.version}"
 
     httpserver.expect_request(target_url).respond_with_data(data)
     result, outcome = DepsDevRepoFinder().find_repo(purl)
@@ -45,9 +43,7 @@ def test_find_repo_links_failures(
 def test_find_repo_success(httpserver: HTTPServer, deps_dev_service_mock: dict) -> None:
     """Test repo finder success."""
     purl = PackageURL.from_string("pkg:pypi/example@2")
-    target_url = (
-        f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/pkg:{purl.type}/{purl.name}@{purl.version}"
-    )
+    target_url = f"{deps_dev_service_mock['purl_path']}/pkg:{purl.type}/{purl.name}@{purl.version}"
 
     httpserver.expect_request(target_url).respond_with_data('{"links": [{"url": "http://github.com/oracle/macaron"}]}')
     result, outcome = DepsDevRepoFinder().find_repo(purl)
@@ -110,7 +106,7 @@ def test_get_latest_version_failures(
     purl = PackageURL.from_string(purl_string)
 
     if server_url:
-        target_url = f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/pkg:{purl.type}/{purl.name}"
+        target_url = f"{deps_dev_service_mock['purl_path']}/pkg:{purl.type}/{purl.name}"
         httpserver.expect_request(target_url).respond_with_data(data)
 
     result, outcome = DepsDevRepoFinder().get_latest_version(purl)
@@ -122,7 +118,7 @@ def test_get_latest_version_failures(
 def test_get_latest_version_success(httpserver: HTTPServer, deps_dev_service_mock: dict) -> None:
     """Test get latest version success."""
     purl = PackageURL.from_string("pkg:pypi/test@3")
-    target_url = f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/pkg:{purl.type}/{purl.name}"
+    target_url = f"{deps_dev_service_mock['purl_path']}/pkg:{purl.type}/{purl.name}"
     httpserver.expect_request(target_url).respond_with_data(
         '{"version": [{"versionKey":{"version": "4"}, "isDefault":true}]}'
     )
@@ -156,7 +152,7 @@ def test_get_attestation_failures(
 
     if server_url:
         assert purl.version
-        target_url = f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/{purl}"
+        target_url = f"{deps_dev_service_mock['purl_path']}/{purl}"
         if "*replace_url*" in data:
             attestation_url = (
                 f"{deps_dev_service_mock['base_scheme']}://{deps_dev_service_mock['base_netloc']}{target_url}"
@@ -172,7 +168,7 @@ def test_get_attestation_failures(
 def test_get_attestation_success(httpserver: HTTPServer, deps_dev_service_mock: dict) -> None:
     """Test get attestation success."""
     purl = PackageURL.from_string("pkg:pypi/test@3")
-    target_url = f"/{deps_dev_service_mock['api']}/{deps_dev_service_mock['purl']}/{purl}"
+    target_url = f"{deps_dev_service_mock['purl_path']}/{purl}"
     attestation_url = f"{deps_dev_service_mock['base_scheme']}://{deps_dev_service_mock['base_netloc']}{target_url}"
     data = """
         {
@@ -1,4 +1,4 @@
-# Copyright (c) 2023 - 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2023 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """Tests for the GitLab git service."""
@@ -198,11 +198,18 @@ def test_origin_remote_url_masking(self_hosted_gitlab: Git, expected_origin_url:
             gitlab.clone_repo(str(tmp_path), expected_origin_url)
             assert git_url.get_remote_origin_of_local_repo(self_hosted_gitlab) == expected_origin_url
 
-        with mock.patch("macaron.slsa_analyzer.git_url.check_out_repo_target", return_value=self_hosted_gitlab.repo):
+        with (
+            mock.patch("macaron.slsa_analyzer.git_url.check_out_repo_target", return_value=self_hosted_gitlab.repo),
+            mock.patch(
+                "macaron.slsa_analyzer.git_url.invalidate_repo_cache", wraps=git_url.invalidate_repo_cache
+            ) as invalidate_repo_cache,
+        ):
             # We check that after checking out the latest commit in the default branch, the origin remote
             # URL is as expected.
             gitlab.check_out_repo(self_hosted_gitlab, branch="", digest="", offline_mode=True)
             assert git_url.get_remote_origin_of_local_repo(self_hosted_gitlab) == expected_origin_url
+            # The cached origin remote is dropped after each change of the origin remote URL.
+            assert invalidate_repo_cache.call_args_list == [mock.call(self_hosted_gitlab)] * 2
 
             gitlab.check_out_repo(self_hosted_gitlab, branch="", digest="", offline_mode=False)
             assert git_url.get_remote_origin_of_local_repo(self_hosted_gitlab) == expected_origin_url
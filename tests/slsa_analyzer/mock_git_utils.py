@@ -1,4 +1,4 @@
-# Copyright (c) 2022 - 2025, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2022 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """
@@ -7,13 +7,16 @@ This module contains the methods for preparing mock git repositories for testing
 
 import os
 
-import git
 from git.exc import GitError
+from git.repo import Repo
 from pydriller.git import Git
 
 from macaron.database.table_definitions import Analysis, Component, RepoFinderMetadata, Repository
 from macaron.slsa_analyzer.analyze_context import AnalyzeContext
 
+_PREPARED_REPO_PATHS: set[str] = set()
+"""The real paths of the repositories whose untracked files have been committed by ``prepare_repo_for_testing``."""
+
 
 def initiate_repo(repo_path: str | os.PathLike, git_init_options: dict | None = None) -> Git:
     """Init the repo at `repo_path` and return a Git wrapper of that repository.
@@ -45,7 +48,7 @@ def initiate_repo(repo_path: str | os.PathLike, git_init_options: dict | None =
         return git_wrapper
     except GitError:
         # No git repo at repo_path.
-        git.Repo.init(repo_path, **git_init_options)
+        Repo.init(repo_path, **git_init_options)
         return Git(repo_path)
 
 
@@ -95,9 +98,14 @@ def prepare_repo_for_testing(
     """
     git_repo = initiate_repo(repo_path)
 
-    # Commit untracked files
-    if git_repo.repo.untracked_files:
-        commit_files(git_repo, git_repo.repo.untracked_files)
+    # Commit untracked files. Listing them runs ``git status``, so this is only done the first time a repo is
+    # prepared in the test session.
+    real_repo_path = os.path.realpath(repo_path)
+    if real_repo_path not in _PREPARED_REPO_PATHS:
+        untracked_files = git_repo.repo.untracked_files
+        if untracked_files:
+            commit_files(git_repo, untracked_files)
+        _PREPARED_REPO_PATHS.add(real_repo_path)
 
     component = Component(
         purl="pkg:github/package-url/purl-spec@244fd47e07d1004f0aed9c",
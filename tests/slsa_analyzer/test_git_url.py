@@ -1,19 +1,26 @@
-# Copyright (c) 2023 - 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2023 - 2026, Oracle and/or its affiliates. All rights reserved.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/.
 
 """This module tests the generic actions on Git repositories."""
 
 import configparser
 import os
+import subprocess  # nosec B404
+from collections.abc import Iterator
 from pathlib import Path
+from unittest import mock
 
+import git
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
+from pydriller.git import Git
 
 from macaron.config.defaults import defaults, load_defaults
+from macaron.errors import CloneError
 from macaron.slsa_analyzer import git_url
 from macaron.slsa_analyzer.git_url import resolve_local_path
+from tests.slsa_analyzer.mock_git_utils import initiate_repo
 
 
 @pytest.mark.parametrize(
@@ -134,10 +141,12 @@ def test_get_remote_vcs_url() -> None:
     assert git_url.get_remote_vcs_url("ssh://gitlab.com:org/name.git") == ""
     assert git_url.get_remote_vcs_url("https://github.com/org") == ""
     assert git_url.get_remote_vcs_url("https://example.com") == ""
+    assert git_url.get_remote_vcs_url(f"https://github.com/org/{'a' * 2048}") == ""
     assert git_url.get_remote_vcs_url("https://unsupported.host.com/org/name") == ""
     assert git_url.get_remote_vcs_url("git@unsupported.host.com:org/name/") == ""
     assert git_url.get_remote_vcs_url("git@github.com:org/") == ""
     assert git_url.get_remote_vcs_url("git@github.com:7999/org/") == ""
+    assert git_url.get_remote_vcs_url("e3a1b6c8d9b2ff0c9f5f8a0a5d8f4cf2e19b1db3") == ""
 
 
 @pytest.mark.parametrize(
@@ -245,6 +254,48 @@ def test_get_remote_vcs_url_with_user_defined_allowed_hostnames(tmp_path: Path)
 def test_get_unique_path(url: str, path: str) -> None:
     """Test the get unique path method."""
     assert git_url.get_repo_dir_name(url) == os.path.normpath(path)
+    assert not git_url.get_repo_dir_name(f"{url}/{'a' * 2048}")
+
+
+@pytest.mark.parametrize(
+    ("url", "path"),
+    [
+        ("https://github.com/apache/maven", "github.com/apache/maven"),
+        ("https://github.com/apache/maven.git", "github.com/apache/maven"),
+        ("https://gitlab.com/apache/maven.git.git", "gitlab.com/apache/maven.git"),
+        ("https://github.com/apache/maven/tree/master", "github.com/apache/maven"),
+        ("git@github.com:apache/maven", "github.com/apache/maven"),
+        ("https://github.com/apache/.git", ""),
+        ("https://unsupported.host.com/apache/maven", ""),
+    ],
+)
+def test_get_unique_path_without_sanitize(url: str, path: str) -> None:
+    """Test the get unique path method without sanitizing the git host."""
+    assert git_url.get_repo_dir_name(url, sanitize=False) == path
+
+
+@pytest.mark.parametrize(
+    ("hostname", "sanitized_hostname"),
+    [
+        ("_git-server.internal.org", "mcn_git_server_internal_org"),
+        ("Git-Server.Internal.org", "git_server_internal_org"),
+    ],
+)
+def test_get_unique_path_sanitize_self_hosted(tmp_path: Path, hostname: str, sanitized_hostname: str) -> None:
+    """Test that the get unique path method sanitizes the host of a self-hosted git service."""
+    user_config_path = os.path.join(tmp_path, "config.ini")
+    with open(user_config_path, "w", encoding="utf-8") as user_config_file:
+        user_config_file.write(
+            f"""
+            [git_service.gitlab.self_hosted]
+            hostname = {hostname}
+            """
+        )
+    load_defaults(user_config_path)
+
+    url = f"https://{hostname}/apache/maven"
+    assert git_url.get_repo_dir_name(url) == f"{sanitized_hostname}/apache/maven"
+    assert git_url.get_repo_dir_name(url, sanitize=False) == f"{hostname}/apache/maven"
 
 
 @pytest.mark.parametrize(
@@ -309,6 +360,7 @@ def test_clean_url_valid_input(url: str, expected: str) -> None:
     [
         "",
         "askjdlkajsdlkajsdlkjasldjlk:scm",
+        "e3a1b6c8d9b2ff0c9f5f8a0a5d8f4cf2e19b1db3",
     ],
 )
 def test_clean_url_invalid_input(url: str) -> None:
@@ -353,3 +405,171 @@ def test_resolve_invalid_parent_path() -> None:
 def test_resolve_valid_local_path(parent_dir: str, target: str) -> None:
     """Test the resolve local path method with valid local paths."""
     assert resolve_local_path(parent_dir, target) == parent_dir
+
+
+@pytest.fixture(name="cloned_repo")
+def cloned_repo_(tmp_path: Path) -> tuple[Git, list[str]]:
+    """Clone a local repository with a ``master`` and a ``dev`` branch.
+
+    The first commit is in both branches and the second commit is only in the ``dev`` branch.
+    """
+    origin = initiate_repo(tmp_path / "origin", git_init_options={"initial_branch": "master"})
+    commits = [origin.repo.index.commit(message="Commit_0").hexsha]
+    origin.repo.create_head("dev").checkout()
+    commits.append(origin.repo.index.commit(message="Commit_1").hexsha)
+    origin.repo.heads.master.checkout()
+
+    git.Repo.clone_from(str(tmp_path / "origin"), str(tmp_path / "clone"))
+    return Git(str(tmp_path / "clone")), commits
+
+
+@pytest.mark.parametrize(
+    ("branch_name", "commit_index", "expected"),
+    [
+        ("master", 0, True),
+        ("dev", 0, True),
+        ("dev", 1, True),
+        ("master", 1, False),
+        ("non_existing_branch", 0, False),
+    ],
+)
+def test_check_out_repo_target_commit_in_branch(
+    cloned_repo: tuple[Git, list[str]], branch_name: str, commit_index: int, expected: bool
+) -> None:
+    """Test checking out a commit that is required to be in a branch."""
+    git_obj, commits = cloned_repo
+    assert git_url.check_out_repo_target(git_obj, branch_name, commits[commit_index]) == expected
+
+
+def test_invalidate_repo_cache(cloned_repo: tuple[Git, list[str]], tmp_path: Path) -> None:
+    """Test that the cached origin remote of a repository is refreshed after its url is changed."""
+    git_obj, _ = cloned_repo
+    assert git_url.get_remote_origin_of_local_repo(git_obj) == str(tmp_path / "origin")
+
+    git_obj.repo.remote("origin").set_url("https://github.com/owner/name")
+    git_url.invalidate_repo_cache(git_obj)
+    assert git_url.get_remote_origin_of_local_repo(git_obj) == "https://github.com/owner/name"
+
+
+@pytest.mark.parametrize("branch", ["dev", ""])
+def test_clone_remote_repo_shallow(cloned_repo: tuple[Git, list[str]], tmp_path: Path, branch: str) -> None:
+    """Test making a shallow clone of a single branch or a single commit that is not in the default branch."""
+    _, commits = cloned_repo
+    digest = "" if branch else commits[1]
+    repo = git_url.clone_remote_repo(
+        str(tmp_path / "clones" / "origin"), f"file://{tmp_path / 'origin'}", branch=branch, digest=digest
+    )
+
+    assert repo is not None
+    assert repo.git.rev_parse("--is-shallow-repository") == "true"
+    assert repo.commit(commits[1]).hexsha == commits[1]
+    if branch:
+        assert [ref.name for ref in repo.remote("origin").refs] == [f"origin/{branch}"]
+
+
+@pytest.mark.usefixtures("cloned_repo")
+def test_clone_remote_repo_shallow_fetch_failure(tmp_path: Path) -> None:
+    """Test that a shallow clone fails if the commit cannot be fetched from the remote repository."""
+    clone_dir, url = str(tmp_path / "clones" / "origin"), f"file://{tmp_path / 'origin'}"
+    with pytest.raises(CloneError, match="^Failed to fetch commit .*non-zero return code"):
+        git_url.clone_remote_repo(clone_dir, url, digest="0" * 40)
+
+    cloned: subprocess.CompletedProcess[bytes] = subprocess.CompletedProcess(args=[], returncode=0)
+    with (
+        mock.patch("macaron.slsa_analyzer.git_url.subprocess.run", side_effect=[cloned, OSError]),
+        pytest.raises(CloneError, match=f"^Failed to fetch commit {'0' * 40}.$"),
+    ):
+        git_url.clone_remote_repo(str(tmp_path / "clones" / "other"), url, digest="0" * 40)
+
+
+def test_list_remote_references_many(cloned_repo: tuple[Git, list[str]], tmp_path: Path) -> None:
+    """Test retrieving references from several repositories concurrently."""
+    _, commits = cloned_repo
+    origin, clone, missing = str(tmp_path / "origin"), str(tmp_path / "clone"), str(tmp_path / "missing")
+    git.Repo(origin).create_tag("v1.0.0", ref=commits[0])
+    with mock.patch("macaron.config.global_config.global_config.output_path", str(tmp_path)):
+        heads, tags, clone_heads, missing_refs = git_url.list_remote_references_many(
+            [(["--heads"], origin), (["--tags"], origin), (["--heads"], clone), ([], missing)]
+        )
+        assert heads == git_url.list_remote_references(["--heads"], origin)
+
+    assert f"{commits[1]}\trefs/heads/dev" in (heads or "")
+    assert tags == f"{commits[0]}\trefs/tags/v1.0.0\n"
+    assert f"{commits[0]}\trefs/heads/master" in (clone_heads or "")
+    assert missing_refs is None
+    assert not git_url.list_remote_references_many([])
+
+
+@pytest.fixture(name="tags_cache")
+def tags_cache_() -> Iterator[None]:
+    """Empty the process-wide cache of remote tags before and after a test."""
+    git_url._TAGS_CACHE.clear()  # pylint: disable=protected-access
+    yield
+    git_url._TAGS_CACHE.clear()  # pylint: disable=protected-access
+
+
+@pytest.mark.usefixtures("tags_cache")
+def test_get_tags_via_git_remote_cached(cloned_repo: tuple[Git, list[str]], tmp_path: Path) -> None:
+    """Test that the tags of a repository are retrieved once and returned as copies."""
+    _, commits = cloned_repo
+    origin = tmp_path / "origin"
+    git.Repo(origin).create_tag("v1.0.0", ref=commits[0])
+
+    with mock.patch("macaron.config.global_config.global_config.output_path", str(tmp_path)):
+        tags = git_url.get_tags_via_git_remote(str(origin))
+    assert tags == {"v1.0.0": commits[0]}
+    tags["v2.0.0"] = commits[1]
+
+    with mock.patch("macaron.slsa_analyzer.git_url.list_remote_references_bytes", return_value=None) as list_references:
+        assert git_url.get_tags_via_git_remote(str(origin)) == {"v1.0.0": commits[0]}
+        list_references.assert_not_called()
+
+        assert git_url.get_tags_via_git_remote(str(tmp_path / "missing")) is None
+        assert git_url.get_tags_via_git_remote(str(tmp_path / "missing")) is None
+        assert list_references.call_count == 2
+
+
+@pytest.mark.usefixtures("tags_cache")
+def test_get_tags_via_git_remote_annotated_tags() -> None:
+    """Test that annotated tags are mapped to the commit of their peeled reference."""
+    tag_data = (
+        b"aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa\trefs/tags/v1.0\n"
+        b"bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb\trefs/tags/v1.0^{}\n"
+        b"cccccccccccccccccccccccccccccccccccccccc\trefs/tags/v2\n"
+    )
+    with mock.patch("macaron.slsa_analyzer.git_url.list_remote_references_bytes", return_value=tag_data):
+        assert git_url.get_tags_via_git_remote("https://github.com/owner/annotated") == {
+            "v1.0": "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
+            "v2": "cccccccccccccccccccccccccccccccccccccccc",
+        }
+
+
+def test_is_empty_repo(tmp_path: Path) -> None:
+    """Test checking whether a repository has a commit checked out."""
+    git_obj = initiate_repo(tmp_path / "repo", git_init_options={"initial_branch": "master"})
+    assert git_url.is_empty_repo(git_obj)
+
+    commit = git_obj.repo.index.commit(message="Commit_0")
+    assert not git_url.is_empty_repo(git_obj)
+
+    # The reference of the branch is moved from a loose reference to the packed-refs file.
+    git_obj.repo.git.pack_refs("--all")
+    assert not (tmp_path / "repo" / ".git" / "refs" / "heads" / "master").exists()
+    assert not git_url.is_empty_repo(git_obj)
+
+    git_obj.repo.git.checkout(commit.hexsha)
+    assert not git_url.is_empty_repo(git_obj)
+
+    git_obj.repo.git.checkout("--orphan", "orphan")
+    assert git_url.is_empty_repo(git_obj)
+
+
+def test_is_empty_repo_fallback(tmp_path: Path) -> None:
+    """Test checking whether a repository has a commit checked out when its HEAD cannot be read directly."""
+    git_obj = initiate_repo(tmp_path / "repo")
+    git_obj.repo.index.commit(message="Commit_0")
+    (tmp_path / "repo" / ".git" / "reftable").mkdir()
+
+    with mock.patch("macaron.slsa_analyzer.git_url._is_empty_repo_via_rev_parse", return_value=False) as rev_parse:
+        assert not git_url.is_empty_repo(git_obj)
+        rev_parse.assert_called_once_with(git_obj)